@@ -13,12 +13,14 @@ scans them using JSHunter, and sends findings to Discord webhooks.
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
 import threading
 import time
-from datetime import datetime
+from itertools import chain
+from collections import deque
 
 # Handle Python 2/3 compatibility for urllib
 try:
@@ -26,28 +28,233 @@ try:
 except ImportError:
     from urlparse import urlparse, urljoin
 
+# Handle Python 2/3 compatibility for queue
+try:
+    from queue import Queue, Empty
+except ImportError:
+    from Queue import Queue, Empty
+
 # Use Java's built-in HTTP capabilities instead of Python requests
-from java.net import URL, HttpURLConnection
-from java.io import BufferedReader, InputStreamReader, OutputStreamWriter
+from java.net import URI, URL
+from java.net.http import HttpClient, HttpRequest, HttpResponse
+from java.time import Duration, LocalDateTime
+from java.time.format import DateTimeFormatter
+from java.io import BufferedOutputStream, ByteArrayOutputStream, File, FileOutputStream
+from java.security import MessageDigest
 
 # Burp Suite API imports
-from burp import IBurpExtender, IHttpListener, ITab
+from burp import IBurpExtender, IHttpListener, ITab, IExtensionStateListener
 from java.awt import BorderLayout, FlowLayout, GridBagLayout, GridBagConstraints, Insets, Dimension
 from java.awt.event import ActionListener, MouseAdapter
 from javax.swing import (JPanel, JTextField, JCheckBox, JButton, JTable, JTextArea, 
                         JScrollPane, JLabel, JOptionPane, BorderFactory, JFileChooser,
-                        ListSelectionModel, JDialog, JSplitPane)
+                        ListSelectionModel, JDialog, JSplitPane, SwingUtilities, Timer)
+from javax.swing.filechooser import FileFilter
 from javax.swing.table import DefaultTableModel, TableRowSorter
-from java.util import ArrayList, Date
-from java.util.concurrent import ConcurrentHashMap
+from java.util import Date, Vector
+from java.util.concurrent import (ConcurrentHashMap, ConcurrentLinkedQueue, Executors, LinkedBlockingQueue,
+                                  RejectedExecutionHandler, ThreadFactory, ThreadPoolExecutor, TimeUnit)
+from java.util.concurrent.atomic import AtomicBoolean
+from java.lang import Runnable, Runtime, String, StringBuilder, Thread
+
+# Use Jackson for JSON output when it is on the classpath; it is much faster than
+# Jython's pure-Python json module. Fall back to json otherwise. Writers and
+# encoders are built once and shared; both are thread-safe.
+try:
+    from com.fasterxml.jackson.databind import ObjectMapper, SerializationFeature
+    _MAPPER = ObjectMapper()
+    _JSON_WRITER_COMPACT = _MAPPER.writer()
+    # For values written one by one into a shared generator; flushing after each
+    # value would push every element through to the underlying stream
+    _JSON_WRITER_STREAM = _MAPPER.writer().without(SerializationFeature.FLUSH_AFTER_WRITE_VALUE)
+except ImportError:
+    _MAPPER = None
+    _JSON_WRITER_COMPACT = None
+    _JSON_WRITER_STREAM = None
+_JSON_ENCODER_COMPACT = json.JSONEncoder()
+_JSON_ENCODER_PRETTY = json.JSONEncoder(indent=2)
+
+# Scan pool sizing: downloads and TruffleHog runs are I/O-bound, so a small
+# fixed pool keeps throughput without spawning a thread per JavaScript URL.
+SCAN_POOL_SIZE = max(4, 2 * Runtime.getRuntime().availableProcessors())
+SCAN_QUEUE_CAPACITY = 1024
+
+# Worker threads for network/process calls started from the UI, so the EDT never blocks
+NET_POOL_SIZE = 4
+
+# Table rows produced by scan threads are added on the EDT in batches at this interval
+TABLE_FLUSH_INTERVAL_MS = 200
+# Activity log lines are appended in one batch per tick
+LOG_FLUSH_INTERVAL_MS = 100
+# Settings changes are written once the UI has been quiet for this long
+SETTINGS_SAVE_DELAY_MS = 500
+# Once the activity log passes LOG_MAX_CHARS the oldest text is dropped down to LOG_TRIM_CHARS
+LOG_MAX_CHARS = 200000
+LOG_TRIM_CHARS = 150000
+
+# Oldest scan results (and their table rows) are evicted beyond this many
+MAX_SCAN_RESULTS = 5000
+
+# TruffleHog is run once per batch of downloaded files to amortize process startup
+SCAN_BATCH_SIZE = 32
+SCAN_BATCH_WINDOW = 3.0  # seconds
+TRUFFLEHOG_TIMEOUT = 60  # base seconds per TruffleHog run
+TRUFFLEHOG_TIMEOUT_PER_FILE = 15  # extra seconds per file in a batch
+TRUFFLEHOG_VERSION_TIMEOUT = 5  # seconds for `trufflehog --version`
+TRUFFLEHOG_CONCURRENCY = 4
+
+# Script src attributes or standalone JavaScript URLs, matched in a single pass
+JS_URL_RE = re.compile(
+    r'<script[^>]+src\s*=\s*["\'](?P<src>[^"\']+\.js(?:\?[^"\']*)?(?:#[^"\']*)?)["\']'
+    r'|(?P<abs>https?://[^\s"\'<>]+\.js(?:\?[^\s"\'<>]*)?(?:#[^\s"\'<>]*)?)',
+    re.I)
+
+# Only these bodies are searched for JavaScript URLs; anything else is skipped
+SCANNABLE_CONTENT_TYPES = frozenset([
+    "text/html",
+    "application/xhtml+xml",
+    "application/javascript",
+    "text/javascript",
+])
+MAX_SCAN_BODY_BYTES = 2 * 1024 * 1024
+
+# Burp's makeHttpRequest returns raw responses, so redirects are followed by hand
+REDIRECT_STATUS_CODES = frozenset([301, 302, 303, 307, 308])
+MAX_DOWNLOAD_REDIRECTS = 5
+
+# Discord webhook limits: 10 embeds and 6000 embed characters per message
+DISCORD_MAX_EMBEDS = 10
+DISCORD_MAX_MESSAGE_CHARS = 6000
+DISCORD_MAX_EMBED_CHARS = 1900
+DISCORD_RAW_CHUNK_CHARS = 1500
+DISCORD_FLUSH_INTERVAL = 2.0  # seconds to collect findings into one webhook call
+DISCORD_MAX_RETRIES = 5
+_DISCORD_STOP = object()
+
+# Upper bound on memoized URL checks; the same CDN/analytics URLs recur constantly
+URL_CACHE_SIZE = 8192
+
+# Write buffer for result exports
+EXPORT_BUFFER_SIZE = 65536
+
+# Timestamp format for log lines and scan results; DateTimeFormatter is immutable and thread-safe
+_TS_FMT = DateTimeFormatter.ofPattern("yyyy-MM-dd HH:mm:ss")
+
+# Where the TruffleHog file chooser starts when the configured path has no usable directory
+TRUFFLEHOG_COMMON_DIRS = ["/usr/local/bin", "/usr/bin", "/opt/trufflehog", os.path.expanduser("~/.local/bin")]
 
 
-class BurpExtender(IBurpExtender, IHttpListener, ITab):
+def _memoize(maxsize):
+    """Cache a single-argument function (Jython 2.7 has no functools.lru_cache)."""
+    def decorator(func):
+        cache = {}
+        
+        def wrapper(arg):
+            try:
+                return cache[arg]
+            except KeyError:
+                pass
+            value = func(arg)
+            if len(cache) >= maxsize:
+                cache.clear()
+            cache[arg] = value
+            return value
+        
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+
+def _is_javascript_url(url):
+    """Check if URL is a JavaScript file by the suffix of its path."""
+    if not url:
+        return False
+    
+    path = url.split('?', 1)[0].split('#', 1)[0]
+    return path[-3:].lower() == '.js' or url[:11].lower() == 'javascript:'
+
+
+class TruffleHogError(Exception):
+    """Raised when a TruffleHog run did not finish cleanly, so its findings are incomplete."""
+
+
+class TruffleHogTimeout(Exception):
+    """Raised when a TruffleHog process had to be killed for running too long."""
+
+
+def _kill_after(proc, timeout):
+    """Kill proc after timeout seconds; returns the started timer and a timed-out event.
+    
+    A timer thread is used because SIGALRM is not safe inside the JVM.
+    """
+    timed_out = threading.Event()
+    
+    def kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+    
+    timer = threading.Timer(timeout, kill_on_timeout)
+    timer.daemon = True
+    timer.start()
+    return timer, timed_out
+
+
+def _dechunk(data, offset):
+    """Decode a chunked transfer-encoded body starting at offset into a new byte array."""
+    out = ByteArrayOutputStream(len(data) - offset)
+    pos = offset
+    end = len(data)
+    while pos < end:
+        # Chunk size line: hex size, optional ;extensions, CRLF
+        line_end = pos
+        while line_end < end and data[line_end] != 10:
+            line_end += 1
+        size_line = "".join(chr(data[i] & 0xff) for i in range(pos, line_end))
+        size = int(size_line.split(";", 1)[0].strip(), 16)
+        pos = line_end + 1
+        if size == 0:
+            break
+        size = min(size, end - pos)
+        out.write(data, pos, size)
+        pos += size + 2  # chunk data is followed by CRLF
+    return out.toByteArray()
+
+
+def _findings_cache_key(content_hash, verify):
+    """Key for _scanned_hashes; findings from an unverified scan must not satisfy a verified one."""
+    return content_hash + ":verified" if verify else content_hash
+
+
+@_memoize(64)
+def _path_exists(path):
+    """Memoized os.path.exists for file chooser directories; stat can be slow on network mounts."""
+    return os.path.exists(path)
+
+
+@_memoize(URL_CACHE_SIZE)
+def _normalize_url(url):
+    """Normalize URL."""
+    try:
+        # Handle relative URLs
+        if url.startswith('//'):
+            url = 'https:' + url
+        elif url.startswith('/'):
+            # Skip relative URLs for now
+            return None
+        
+        parsed_url = urlparse(url)
+        return parsed_url.geturl()
+    except:
+        return None
+
+
+class BurpExtender(IBurpExtender, IHttpListener, ITab, IExtensionStateListener):
     """
     Main Burp Suite extension class that implements:
     - IBurpExtender: Entry point for the extension
     - IHttpListener: Monitors HTTP traffic
     - ITab: Provides custom UI tab
+    - IExtensionStateListener: Releases background workers on unload
     """
     
     def registerExtenderCallbacks(self, callbacks):
@@ -61,18 +268,66 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         # Register HTTP listener
         callbacks.registerHttpListener(self)
         
+        # Register unload hook
+        callbacks.registerExtensionStateListener(self)
+        
         # Initialize data structures
         self._scanned_urls = ConcurrentHashMap()
-        self._scan_results = ArrayList()
+        self._scanned_hashes = ConcurrentHashMap()  # _findings_cache_key(...) -> (verified, unverified)
+        self._scan_results = deque(maxlen=MAX_SCAN_RESULTS)
+        
+        # Network and subprocess work triggered from the UI
+        self._net_exec = Executors.newFixedThreadPool(NET_POOL_SIZE)
+        
+        # Optional second TruffleHog pass that verifies candidate secrets over the network
+        self._verify_executor = Executors.newSingleThreadExecutor(LowPriorityThreadFactory())
+        
+        # Bounded scan pool; when the queue is full the oldest pending scan is dropped
+        self._scan_executor = ThreadPoolExecutor(
+            SCAN_POOL_SIZE, SCAN_POOL_SIZE, 60, TimeUnit.SECONDS,
+            LinkedBlockingQueue(SCAN_QUEUE_CAPACITY), DropOldestScanPolicy(self))
+        self._scan_executor.allowCoreThreadTimeOut(True)
+        
+        # Downloaded files waiting for the next TruffleHog batch
+        self._scan_queue = deque()
+        self._scan_queue_lock = threading.Condition()
+        self._active_batch_dirs = ConcurrentHashMap()  # batch dirs still in use -> True
+        self._unloading = False
+        
+        # (path, mtime, size) -> TruffleHog version string, or None if the binary is invalid
+        self._trufflehog_verify_cache = {}
+        self._trufflehog_initial_dir = None  # set by _resolve_trufflehog_initial_dir
+        
+        # Discord embeds waiting for the sender thread
+        self._discord_queue = Queue()
+        
+        # Shared webhook client; its connection pool keeps the TLS session to Discord alive
+        self._http_client = (HttpClient.newBuilder()
+                             .version(HttpClient.Version.HTTP_2)
+                             .connectTimeout(Duration.ofSeconds(10))
+                             .build())
+        
+        # (table model, row, scan result or None) waiting to be added on the EDT
+        self._pending_rows = []
+        self._pending_rows_lock = threading.Lock()
+        
+        # Log lines waiting for the next EDT flush; created early since settings loading logs
+        self._log_queue = ConcurrentLinkedQueue()
         
         # Configuration
         self._discord_webhook_url = ""
         self._auto_scan_enabled = True
         self._send_to_discord_enabled = True
+        self._verify_secrets_enabled = False
         
         # Load saved settings
         self._load_settings()
         
+        # Debounced settings persistence; see _request_save_settings
+        self._settings_dirty = AtomicBoolean(False)
+        self._settings_save_timer = Timer(SETTINGS_SAVE_DELAY_MS, SettingsSaveListener(self))
+        self._settings_save_timer.setRepeats(False)
+        
         # Create UI
         self._create_ui()
         
@@ -87,6 +342,28 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         
         # Clean up any leftover temp files from previous sessions
         self._cleanup_temp_files()
+        
+        # Start the TruffleHog batch consumer
+        self._batch_thread = threading.Thread(target=self._batch_scan_worker)
+        self._batch_thread.daemon = True
+        self._batch_thread.start()
+        
+        # Start the Discord sender
+        self._discord_thread = threading.Thread(target=self._discord_sender_worker)
+        self._discord_thread.daemon = True
+        self._discord_thread.start()
+        
+        # Resolve the TruffleHog file chooser's fallback directory without blocking startup
+        initial_dir_thread = threading.Thread(target=self._resolve_trufflehog_initial_dir)
+        initial_dir_thread.daemon = True
+        initial_dir_thread.start()
+    
+    def _resolve_trufflehog_initial_dir(self):
+        """Remember the first common TruffleHog directory that exists."""
+        for path in TRUFFLEHOG_COMMON_DIRS:
+            if _path_exists(path):
+                self._trufflehog_initial_dir = path
+                return
     
     def _load_settings(self):
         """Load saved settings from Burp Suite."""
@@ -105,6 +382,11 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             saved_send_discord = self._callbacks.loadExtensionSetting("send_to_discord_enabled")
             if saved_send_discord:
                 self._send_to_discord_enabled = saved_send_discord.lower() == "true"
+            
+            # Load secret verification setting
+            saved_verify_secrets = self._callbacks.loadExtensionSetting("verify_secrets_enabled")
+            if saved_verify_secrets:
+                self._verify_secrets_enabled = saved_verify_secrets.lower() == "true"
                 
         except Exception as e:
             self._log_message("Error loading settings: " + str(e))
@@ -121,9 +403,22 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             # Save send to Discord setting
             self._callbacks.saveExtensionSetting("send_to_discord_enabled", str(self._send_to_discord_enabled).lower())
             
+            # Save secret verification setting
+            self._callbacks.saveExtensionSetting("verify_secrets_enabled", str(self._verify_secrets_enabled).lower())
+            
         except Exception as e:
             self._log_message("Error saving settings: " + str(e))
     
+    def _request_save_settings(self):
+        """Mark settings dirty and (re)start the save timer. Call from the EDT."""
+        self._settings_dirty.set(True)
+        self._settings_save_timer.restart()
+    
+    def _flush_settings(self):
+        """Save dirty settings on a worker thread. Runs on the EDT when the save timer fires."""
+        if self._settings_dirty.getAndSet(False):
+            self._net_exec.execute(lambda: self._save_settings())
+    
     def _create_ui(self):
         """Create the extension UI."""
         self._main_panel = JPanel(BorderLayout())
@@ -149,6 +444,12 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         # Log panel
         log_panel = self._create_log_panel()
         self._main_panel.add(log_panel, BorderLayout.SOUTH)
+        
+        # Periodic EDT flush of rows queued by scan threads
+        self._table_flush_timer = Timer(TABLE_FLUSH_INTERVAL_MS, PendingRowsListener(self))
+        self._table_flush_timer.start()
+        self._log_flush_timer = Timer(LOG_FLUSH_INTERVAL_MS, LogFlushListener(self))
+        self._log_flush_timer.start()
     
     def _create_config_panel(self):
         """Create the configuration panel."""
@@ -184,28 +485,34 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         self._send_to_discord_checkbox.addActionListener(SendToDiscordListener(self))
         panel.add(self._send_to_discord_checkbox, gbc)
         
+        # Verify secrets checkbox
+        gbc.gridx = 0; gbc.gridy = 3; gbc.gridwidth = 2
+        self._verify_secrets_checkbox = JCheckBox("Verify secrets (slower, sends network requests)", self._verify_secrets_enabled)
+        self._verify_secrets_checkbox.addActionListener(VerifySecretsListener(self))
+        panel.add(self._verify_secrets_checkbox, gbc)
+        
         # TruffleHog Path
-        gbc.gridx = 0; gbc.gridy = 3
+        gbc.gridx = 0; gbc.gridy = 4
         panel.add(JLabel("TruffleHog Path:"), gbc)
-        gbc.gridx = 1; gbc.gridy = 3; gbc.weightx = 1.0; gbc.fill = GridBagConstraints.HORIZONTAL
+        gbc.gridx = 1; gbc.gridy = 4; gbc.weightx = 1.0; gbc.fill = GridBagConstraints.HORIZONTAL
         self._trufflehog_path_field = JTextField(50)
         self._trufflehog_path_field.setText("/usr/local/bin/trufflehog")  # Default path
         panel.add(self._trufflehog_path_field, gbc)
         
         # Browse button for TruffleHog path
-        gbc.gridx = 2; gbc.gridy = 3; gbc.weightx = 0; gbc.fill = GridBagConstraints.NONE
+        gbc.gridx = 2; gbc.gridy = 4; gbc.weightx = 0; gbc.fill = GridBagConstraints.NONE
         self._browse_trufflehog_button = JButton("Browse")
         self._browse_trufflehog_button.addActionListener(BrowseTruffleHogListener(self))
         panel.add(self._browse_trufflehog_button, gbc)
         
         # Test TruffleHog button
-        gbc.gridx = 3; gbc.gridy = 3; gbc.weightx = 0; gbc.fill = GridBagConstraints.NONE
+        gbc.gridx = 3; gbc.gridy = 4; gbc.weightx = 0; gbc.fill = GridBagConstraints.NONE
         self._test_trufflehog_button = JButton("Test")
         self._test_trufflehog_button.addActionListener(TestTruffleHogListener(self))
         panel.add(self._test_trufflehog_button, gbc)
         
         # TruffleHog status
-        gbc.gridx = 0; gbc.gridy = 4; gbc.gridwidth = 3
+        gbc.gridx = 0; gbc.gridy = 5; gbc.gridwidth = 3
         self._trufflehog_status_label = JLabel("TruffleHog: Not tested")
         panel.add(self._trufflehog_status_label, gbc)
         
@@ -227,8 +534,8 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         # Add mouse listener for double-click to view details
         self._results_table.addMouseListener(ResultDetailsListener(self))
         
-        scroll_pane = JScrollPane(self._results_table)
-        panel.add(scroll_pane, BorderLayout.CENTER)
+        self._results_scroll_pane = JScrollPane(self._results_table)
+        panel.add(self._results_scroll_pane, BorderLayout.CENTER)
         
         # Buttons panel
         buttons_panel = JPanel(FlowLayout())
@@ -312,51 +619,68 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         
         try:
             request_info = self._helpers.analyzeRequest(messageInfo)
-            url = request_info.getUrl().toString()
             
             # Extract JavaScript URLs from the request
-            js_urls = self._extract_javascript_urls(messageInfo)
+            js_urls = self._extract_javascript_urls(messageInfo, request_info)
             
             for js_url in js_urls:
-                if js_url not in self._scanned_urls:
-                    self._scanned_urls.put(js_url, True)
+                # putIfAbsent is atomic, so concurrent proxy threads can't both schedule a URL
+                if self._scanned_urls.putIfAbsent(js_url, True) is None:
                     self._log_message("Found JavaScript URL: " + js_url)
                     
-                    # Schedule scan in background
-                    thread = threading.Thread(target=self._scan_javascript_url, args=(js_url,))
-                    thread.daemon = True
-                    thread.start()
+                    # Schedule scan on the bounded pool
+                    self._scan_executor.execute(ScanTask(self, js_url))
                     
         except Exception as e:
             self._log_message("Error processing HTTP message: " + str(e))
     
-    def _extract_javascript_urls(self, messageInfo):
-        """Extract JavaScript URLs from HTTP message."""
+    def extensionUnloaded(self):
+        """Stop background workers when the extension is unloaded."""
+        # Persist a pending settings change before the executors go away
+        self._settings_save_timer.stop()
+        if self._settings_dirty.getAndSet(False):
+            self._save_settings()
+        self._scan_executor.shutdownNow()
+        self._verify_executor.shutdownNow()
+        self._net_exec.shutdownNow()
+        self._table_flush_timer.stop()
+        self._log_flush_timer.stop()
+        with self._scan_queue_lock:
+            self._unloading = True
+            self._scan_queue_lock.notifyAll()
+        self._discord_queue.put(_DISCORD_STOP)
+        print("JSHunter Burp Extension unloaded")
+    
+    def _extract_javascript_urls(self, messageInfo, request_info=None):
+        """Extract JavaScript URLs from HTTP message, reusing the caller's analyzed request if given."""
         js_urls = set()
         
         try:
-            request_info = self._helpers.analyzeRequest(messageInfo)
+            if request_info is None:
+                request_info = self._helpers.analyzeRequest(messageInfo)
             url = request_info.getUrl().toString()
             
             # Check if the request URL itself is a JavaScript file
-            if self._is_javascript_url(url):
+            if _is_javascript_url(url):
                 js_urls.add(url)
             
-            # Extract from request body
+            # Extract from request body (text bodies only)
             request = messageInfo.getRequest()
-            analyzed_request = self._helpers.analyzeRequest(request)
-            body_offset = analyzed_request.getBodyOffset()
+            body_offset = request_info.getBodyOffset()
             if body_offset < len(request):
-                body = request[body_offset:].tostring()
-                js_urls.update(self._extract_urls_from_text(body))
+                content_type = self._get_content_type(request_info.getHeaders())
+                if content_type.startswith("text/") or content_type in SCANNABLE_CONTENT_TYPES:
+                    body = self._body_text(request, body_offset)
+                    js_urls.update(self._extract_urls_from_text(body))
             
-            # Extract from response body if available
+            # Extract from response body if available (HTML/JavaScript only)
             if messageInfo.getResponse() is not None:
                 response = messageInfo.getResponse()
                 analyzed_response = self._helpers.analyzeResponse(response)
                 response_body_offset = analyzed_response.getBodyOffset()
-                if response_body_offset < len(response):
-                    response_body = response[response_body_offset:].tostring()
+                if (response_body_offset < len(response) and
+                        self._get_content_type(analyzed_response.getHeaders()) in SCANNABLE_CONTENT_TYPES):
+                    response_body = self._body_text(response, response_body_offset)
                     js_urls.update(self._extract_urls_from_text(response_body))
                     
         except Exception as e:
@@ -364,67 +688,48 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         
         return js_urls
     
+    def _body_text(self, message, body_offset):
+        """Decode up to MAX_SCAN_BODY_BYTES of a message body without slicing the byte array."""
+        length = min(len(message) - body_offset, MAX_SCAN_BODY_BYTES)
+        # ISO-8859-1 maps bytes 1:1, which is all the ASCII URL patterns need
+        return String(message, body_offset, length, "ISO-8859-1")
+    
+    def _get_content_type(self, headers):
+        """Return the lowercased media type from a header list, or an empty string."""
+        for header in headers:
+            if header.lower().startswith("content-type:"):
+                return header.split(":", 1)[1].split(";", 1)[0].strip().lower()
+        return ""
+    
+    def _get_header(self, headers, name):
+        """Return the value of the first header called name (lowercase) in a header list, or None."""
+        prefix = name + ":"
+        for header in headers:
+            if header.lower().startswith(prefix):
+                return header.split(":", 1)[1].strip()
+        return None
+    
     def _extract_urls_from_text(self, text):
         """Extract JavaScript URLs from text content."""
         urls = set()
         
-        # Pattern for script src attributes
-        script_pattern = r'(?i)<script[^>]+src\s*=\s*["\']([^"\']+\.js(?:\?[^"\']*)?(?:#[^"\']*)?)["\']'
-        script_matches = re.findall(script_pattern, text)
-        
-        for match in script_matches:
-            if self._is_javascript_url(match):
-                normalized_url = self._normalize_url(match)
-                if normalized_url:
-                    urls.add(normalized_url)
-        
-        # Pattern for standalone JavaScript URLs
-        js_pattern = r'(?i)(?:https?://[^\s"\'<>]+\.js(?:\?[^\s"\'<>]*)?(?:#[^\s"\'<>]*)?)'
-        js_matches = re.findall(js_pattern, text)
-        
-        for match in js_matches:
-            if self._is_javascript_url(match):
-                normalized_url = self._normalize_url(match)
-                if normalized_url:
-                    urls.add(normalized_url)
+        # The pattern already requires a .js path, so matches need no further check
+        for match in JS_URL_RE.finditer(text):
+            normalized_url = _normalize_url(match.group('src') or match.group('abs'))
+            if normalized_url:
+                urls.add(normalized_url)
         
         return urls
     
-    def _is_javascript_url(self, url):
-        """Check if URL is a JavaScript file."""
-        if not url or not url.strip():
-            return False
-        
-        url_lower = url.lower().strip()
-        return (url_lower.endswith('.js') or 
-                '.js?' in url_lower or 
-                '.js#' in url_lower or
-                'javascript:' in url_lower or
-                'application/javascript' in url_lower)
-    
-    def _normalize_url(self, url):
-        """Normalize URL."""
-        try:
-            # Handle relative URLs
-            if url.startswith('//'):
-                url = 'https:' + url
-            elif url.startswith('/'):
-                # Skip relative URLs for now
-                return None
-            
-            parsed_url = urlparse(url)
-            return parsed_url.geturl()
-        except:
-            return None
-    
     def _scan_javascript_url(self, url):
-        """Scan a JavaScript URL using TruffleHog directly."""
+        """Download a JavaScript URL and queue it for the next TruffleHog batch."""
         self._log_message("Scanning JavaScript URL: " + url)
         
         result = {
             'url': url,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'findings': [],
+            'timestamp': LocalDateTime.now().format(_TS_FMT),
+            'verified': [],
+            'unverified': [],
             'success': False,
             'error': None
         }
@@ -435,54 +740,214 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             if not tr_bin:
                 result['error'] = "TruffleHog binary not found. Please install TruffleHog."
                 self._log_message("TruffleHog binary not found")
-                self._add_result_to_table(result)
+                self._complete_scan(result)
                 return result
             
-            # Download JavaScript file
-            js_content = self._download_js_file(url)
-            if not js_content:
+            # Download and hash the JavaScript file
+            download = self._download_javascript(url)
+            if download is None:
                 result['error'] = "Failed to download JavaScript file"
                 self._log_message("Failed to download JavaScript file: " + url)
-                self._add_result_to_table(result)
+                self._complete_scan(result)
                 return result
+            response, body_offset, body_length, content_hash = download
             
-            # Save to temporary file
-            temp_file = self._save_temp_js_file(js_content, url)
-            if not temp_file:
-                result['error'] = "Failed to create temporary file"
-                self._add_result_to_table(result)
+            # Identical content was already scanned under another URL in the current verify mode;
+            # reuse its findings
+            cached_findings = self._scanned_hashes.get(
+                _findings_cache_key(content_hash, self._verify_secrets_enabled))
+            if cached_findings is not None:
+                self._set_findings(result, cached_findings)
+                result['success'] = True
+                self._log_message("Reusing findings for identical content: " + url + " - " + 
+                                  str(len(result['verified']) + len(result['unverified'])) + " findings")
+                self._complete_scan(result)
                 return result
             
-            try:
-                # Run TruffleHog on the file
-                findings = self._run_trufflehog(temp_file, tr_bin)
-                result['findings'] = findings
-                result['success'] = True
-                self._log_message("Scan completed successfully for: " + url + " - " + str(len(findings)) + " findings")
-                
-                # Send to Discord if enabled
-                if self._send_to_discord_enabled and findings:
-                    self._send_to_discord(result)
-                    
-            finally:
-                # Clean up temporary file
-                try:
-                    if os.path.exists(temp_file):
-                        os.unlink(temp_file)
-                        self._log_message("Cleaned up temporary file: " + os.path.basename(temp_file))
-                except Exception as cleanup_error:
-                    self._log_message("Error cleaning up temp file: " + str(cleanup_error))
+            # Only new content is written to disk and handed over to the batch consumer
+            temp_file = self._write_temp_file(url, response, body_offset, body_length)
+            with self._scan_queue_lock:
+                self._scan_queue.append((result, temp_file, content_hash, time.time()))
+                self._scan_queue_lock.notify()
+            return result
                 
         except Exception as e:
             result['error'] = str(e)
             self._log_message("Error scanning " + url + ": " + str(e))
         
+        self._complete_scan(result)
+        return result
+    
+    def _batch_scan_worker(self):
+        """Flush queued files to TruffleHog every SCAN_BATCH_SIZE files or SCAN_BATCH_WINDOW seconds."""
+        while True:
+            with self._scan_queue_lock:
+                while not self._unloading:
+                    if not self._scan_queue:
+                        self._scan_queue_lock.wait()
+                        continue
+                    remaining = SCAN_BATCH_WINDOW - (time.time() - self._scan_queue[0][3])
+                    if len(self._scan_queue) >= SCAN_BATCH_SIZE or remaining <= 0:
+                        break
+                    self._scan_queue_lock.wait(remaining)
+                
+                if self._unloading:
+                    return
+                
+                batch = [self._scan_queue.popleft()
+                         for _ in range(min(SCAN_BATCH_SIZE, len(self._scan_queue)))]
+            
+            try:
+                self._scan_batch(batch)
+            except Exception as e:
+                self._log_message("Error scanning batch: " + str(e))
+    
+    def _scan_batch(self, batch):
+        """Run TruffleHog once over a batch of downloaded files and publish per-URL results."""
+        batch_dir = tempfile.mkdtemp(prefix="jshunter_batch_")
+        self._active_batch_dirs.put(batch_dir, True)
+        results_by_hash = {}
+        
+        try:
+            # Stage each distinct content once, named by its hash so findings map back to URLs
+            for result, temp_file, content_hash, _ in batch:
+                try:
+                    if content_hash in results_by_hash:
+                        os.unlink(temp_file)
+                    else:
+                        shutil.move(temp_file, os.path.join(batch_dir, content_hash + ".js"))
+                        results_by_hash[content_hash] = []
+                    results_by_hash[content_hash].append(result)
+                except Exception as e:
+                    result['error'] = "Failed to stage file for scanning: " + str(e)
+                    self._complete_scan(result)
+            
+            if not results_by_hash:
+                return
+            
+            tr_bin = self._get_trufflehog_binary()
+            if not tr_bin:
+                for results in results_by_hash.values():
+                    for result in results:
+                        result['error'] = "TruffleHog binary not found. Please install TruffleHog."
+                        self._complete_scan(result)
+                return
+            
+            self._log_message("Running TruffleHog on batch of " + str(len(results_by_hash)) + " files")
+            try:
+                findings_by_hash = self._collect_findings(batch_dir, tr_bin, results_by_hash, False)
+            except Exception as e:
+                # Missing findings must not be reported (or cached) as a clean scan
+                self._fail_batch_results(results_by_hash, "TruffleHog scan failed: " + str(e))
+                return
+            
+            # Files with candidate secrets get a verification pass in the background if enabled
+            verify = self._verify_secrets_enabled
+            if verify:
+                to_verify = dict((content_hash, results) for content_hash, results in results_by_hash.items()
+                                 if findings_by_hash[content_hash][0] or findings_by_hash[content_hash][1])
+                if to_verify:
+                    verify_dir = tempfile.mkdtemp(prefix="jshunter_batch_")
+                    self._active_batch_dirs.put(verify_dir, True)
+                    unverified_by_hash = {}
+                    for content_hash in to_verify:
+                        del results_by_hash[content_hash]
+                        unverified_by_hash[content_hash] = findings_by_hash[content_hash]
+                        shutil.move(os.path.join(batch_dir, content_hash + ".js"), verify_dir)
+                    self._verify_executor.execute(
+                        lambda: self._verify_batch(verify_dir, to_verify, unverified_by_hash, tr_bin))
+            
+            self._publish_batch_results(results_by_hash, findings_by_hash, verify)
+                
+        finally:
+            self._remove_batch_dir(batch_dir)
+    
+    def _verify_batch(self, verify_dir, results_by_hash, unverified_by_hash, tr_bin):
+        """Re-scan files that had findings with TruffleHog verification enabled.
+        
+        If the verification run fails, the first pass's findings (unverified_by_hash)
+        are published instead so the URLs are still reported.
+        """
+        try:
+            self._log_message("Verifying secrets in " + str(len(results_by_hash)) + " files")
+            try:
+                findings_by_hash = self._collect_findings(verify_dir, tr_bin, results_by_hash, True)
+                verified = True
+            except Exception as e:
+                self._log_message("Error verifying secrets, reporting unverified findings: " + str(e))
+                findings_by_hash = unverified_by_hash
+                verified = False
+            self._publish_batch_results(results_by_hash, findings_by_hash, verified)
+        finally:
+            self._remove_batch_dir(verify_dir)
+    
+    def _collect_findings(self, batch_dir, tr_bin, results_by_hash, verify):
+        """Run TruffleHog over a batch directory and group findings by content hash.
+        
+        Each hash maps to a (verified, unverified) pair of lists.
+        """
+        findings_by_hash = dict((content_hash, ([], [])) for content_hash in results_by_hash)
+        timeout = TRUFFLEHOG_TIMEOUT + TRUFFLEHOG_TIMEOUT_PER_FILE * len(results_by_hash)
+        for finding in self._run_trufflehog(batch_dir, tr_bin, verify, timeout):
+            filesystem = ((finding.get('SourceMetadata') or {}).get('Data') or {}).get('Filesystem') or {}
+            content_hash = os.path.splitext(os.path.basename(filesystem.get('file', '')))[0]
+            if content_hash in findings_by_hash:
+                # Flatten display values once so the UI and Discord paths do no per-row lookups
+                raw_value = finding.get('Raw', '')
+                finding['_display_raw'] = raw_value if len(raw_value) <= 100 else raw_value[:100] + "..."
+                finding['line'] = filesystem.get('line', 0)
+                findings_by_hash[content_hash][0 if finding.get('Verified', False) else 1].append(finding)
+        return findings_by_hash
+    
+    def _publish_batch_results(self, results_by_hash, findings_by_hash, verify):
+        """Cache findings per content hash and verify mode, and complete every URL that shares the content."""
+        for content_hash, results in results_by_hash.items():
+            findings = findings_by_hash[content_hash]
+            self._scanned_hashes.put(_findings_cache_key(content_hash, verify), findings)
+            for result in results:
+                self._set_findings(result, findings)
+                result['success'] = True
+                self._log_message("Scan completed successfully for: " + result['url'] + " - " + 
+                                  str(len(result['verified']) + len(result['unverified'])) + " findings")
+                self._complete_scan(result)
+    
+    def _fail_batch_results(self, results_by_hash, error):
+        """Complete every URL in a batch whose TruffleHog run failed, without caching anything."""
+        self._log_message(error)
+        for results in results_by_hash.values():
+            for result in results:
+                result['error'] = error
+                self._complete_scan(result)
+    
+    def _set_findings(self, result, findings):
+        """Attach copies of a (verified, unverified) findings pair to result."""
+        verified, unverified = findings
+        result['verified'] = list(verified)
+        result['unverified'] = list(unverified)
+    
+    def _remove_batch_dir(self, batch_dir):
+        """Delete a batch directory once TruffleHog is done with it."""
+        self._active_batch_dirs.remove(batch_dir)
+        try:
+            shutil.rmtree(batch_dir)
+            self._log_message("Cleaned up batch directory: " + os.path.basename(batch_dir))
+        except Exception as cleanup_error:
+            self._log_message("Error cleaning up batch directory: " + str(cleanup_error))
+    
+    def _complete_scan(self, result):
+        """Publish a finished scan result to Discord and the results tables."""
+        has_findings = result['success'] and (result['verified'] or result['unverified'])
+        
+        # Send to Discord if enabled
+        if self._send_to_discord_enabled and has_findings:
+            self._send_to_discord(result)
+        
         # Add result to table
         self._add_result_to_table(result)
         
         # Add findings to findings table
-        if result['success'] and result['findings']:
-            self._add_findings_to_table(result['findings'], result['url'])
+        if has_findings:
+            self._add_findings_to_table(chain(result['verified'], result['unverified']), result['url'])
     
     def _cleanup_temp_files(self):
         """Clean up any remaining temporary JavaScript files."""
@@ -490,7 +955,15 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             temp_dir = tempfile.gettempdir()
             # Look for files that start with "jshunter_" (our temp file prefix)
             for filename in os.listdir(temp_dir):
-                if filename.startswith("jshunter_") and filename.endswith(".js"):
+                if filename.startswith("jshunter_batch_"):
+                    if self._active_batch_dirs.containsKey(os.path.join(temp_dir, filename)):
+                        continue
+                    try:
+                        shutil.rmtree(os.path.join(temp_dir, filename))
+                        self._log_message("Cleaned up leftover batch directory: " + filename)
+                    except Exception as e:
+                        self._log_message("Error cleaning up leftover batch directory " + filename + ": " + str(e))
+                elif filename.startswith("jshunter_") and filename.endswith(".js"):
                     temp_file_path = os.path.join(temp_dir, filename)
                     try:
                         os.unlink(temp_file_path)
@@ -506,42 +979,79 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             detector_name = finding.get('DetectorName', 'Unknown')
             raw_value = finding.get('Raw', '')
             verified = finding.get('Verified', False)
-            line_number = finding.get('SourceMetadata', {}).get('Data', {}).get('Filesystem', {}).get('line', 0)
+            line_number = finding['line']
             
             # Truncate long secrets for display
             display_secret = raw_value[:50] + "..." if len(raw_value) > 50 else raw_value
             
-            # Add row to findings table
+            # Queue row for the findings table
             row = [detector_name, display_secret, source_url, str(line_number), "Yes" if verified else "No"]
-            self._findings_table_model.addRow(row)
+            self._queue_row(self._findings_table_model, row)
     
     def _get_trufflehog_binary(self):
         """Get TruffleHog binary path from user configuration using official PortSwigger method."""
         # Get path from UI field
         configured_path = self._trufflehog_path_field.getText().strip()
-        self._log_message("Checking TruffleHog path: " + configured_path)
         
         if not configured_path:
             self._log_message("No TruffleHog path configured")
             return None
         
         # Use the official PortSwigger verification method
-        if self._verify_trufflehog_path(configured_path):
-            self._log_message("TruffleHog binary validated successfully")
-            return configured_path
-        else:
-            self._log_message("TruffleHog binary validation failed")
+        try:
+            if self._check_trufflehog(configured_path):
+                return configured_path
+        except TruffleHogTimeout:
+            pass
+        self._log_message("TruffleHog binary validation failed")
+        return None
+    
+    def _check_trufflehog(self, path):
+        """Return the TruffleHog version string for path, or None; memoized until the file changes.
+        
+        The mode is part of the key so a chmod +x is picked up. Errors running the binary
+        are not cached since they may be transient.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
             return None
+        
+        key = (path, stat.st_mtime, stat.st_size, stat.st_mode)
+        try:
+            return self._trufflehog_verify_cache[key]
+        except KeyError:
+            pass
+        
+        try:
+            version_info = self._verify_trufflehog_path(path)
+        except TruffleHogTimeout:
+            raise
+        except Exception as e:
+            self._log_message("Error testing TruffleHog binary: " + str(e))
+            return None
+        self._trufflehog_verify_cache[key] = version_info
+        return version_info
     
     def _verify_trufflehog_path(self, path):
-        """Verify TruffleHog path using official PortSwigger method."""
+        """Verify TruffleHog path using official PortSwigger method; returns its version string or None.
+        
+        Raises if the binary could not be run.
+        """
         if not path or not os.path.isabs(path) or not os.access(path, os.X_OK):
             self._log_message("TruffleHog path validation failed: not absolute or not executable")
-            return False
+            return None
         try:
             self._log_message("Testing TruffleHog binary: " + path)
             proc = subprocess.Popen([path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout_data, stderr_data = proc.communicate()
+            timer, timed_out = _kill_after(proc, TRUFFLEHOG_VERSION_TIMEOUT)
+            try:
+                stdout_data, stderr_data = proc.communicate()
+            finally:
+                timer.cancel()
+            if timed_out.is_set():
+                # Not cached by _check_trufflehog, so a later test tries again
+                raise TruffleHogTimeout("TruffleHog --version timed out")
             self._log_message("TruffleHog test - stdout: " + stdout_data.decode('utf-8', errors='ignore').strip() + 
                             ", stderr: " + stderr_data.decode('utf-8', errors='ignore').strip())
             
@@ -549,114 +1059,147 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             combined_output = (stderr_data.lower() + stdout_data.lower())
             if b"trufflehog" in combined_output:
                 self._log_message("TruffleHog binary found in output")
-                return True
+                return (stdout_data + stderr_data).decode('utf-8', errors='ignore').strip() or "trufflehog"
             else:
                 self._log_message("TruffleHog binary not found in output")
-                return False
-        except Exception as e:
-            self._log_message("Error testing TruffleHog binary: " + str(e))
-            return False
+                return None
+        except TruffleHogTimeout:
+            self._log_message("TruffleHog test timeout")
+            raise
     
-    def _download_js_file(self, url):
-        """Download JavaScript file content."""
+    def _download_javascript(self, url):
+        """Download a JavaScript file and return (response, body offset, body length, SHA-1 of body).
+        
+        Returns None on failure. The body is hashed in place so cached content never touches disk.
+        """
         try:
-            # Use Java HTTP to download the file
             url_obj = URL(url)
-            connection = url_obj.openConnection()
-            connection.setRequestMethod("GET")
-            connection.setRequestProperty("User-Agent", "JSHunter-Burp-Extension/1.0")
-            connection.setConnectTimeout(10000)  # 10 seconds
-            connection.setReadTimeout(30000)     # 30 seconds
-            
-            # Read the response
-            input_stream = connection.getInputStream()
-            reader = BufferedReader(InputStreamReader(input_stream, "UTF-8"))
+            for _ in range(MAX_DOWNLOAD_REDIRECTS + 1):
+                # Fetch through Burp so upstream proxy and session handling apply
+                use_https = url_obj.getProtocol().lower() == "https"
+                port = url_obj.getPort()
+                if port == -1:
+                    port = 443 if use_https else 80
+                
+                request = self._helpers.buildHttpRequest(url_obj)
+                response = self._callbacks.makeHttpRequest(url_obj.getHost(), port, use_https, request)
+                if response is None:
+                    self._log_message("No response downloading JS file: " + url)
+                    return None
+                
+                analyzed_response = self._helpers.analyzeResponse(response)
+                headers = analyzed_response.getHeaders()
+                status_code = analyzed_response.getStatusCode()
+                if status_code not in REDIRECT_STATUS_CODES:
+                    break
+                
+                location = self._get_header(headers, "location")
+                if not location:
+                    self._log_message("HTTP " + str(status_code) + " without Location downloading JS file: " + url)
+                    return None
+                # Location may be relative to the URL that redirected
+                url_obj = URL(url_obj, location)
+            else:
+                self._log_message("Too many redirects downloading JS file: " + url)
+                return None
             
-            content = []
-            line = reader.readLine()
-            while line is not None:
-                content.append(line)
-                line = reader.readLine()
+            if not 200 <= status_code < 300:
+                self._log_message("HTTP " + str(status_code) + " downloading JS file: " + url)
+                return None
             
-            reader.close()
-            connection.disconnect()
+            body_offset = analyzed_response.getBodyOffset()
+            if "chunked" in (self._get_header(headers, "transfer-encoding") or "").lower():
+                # makeHttpRequest leaves chunk framing in the body
+                response = _dechunk(response, body_offset)
+                body_offset = 0
+            body_length = len(response) - body_offset
+            if body_length <= 0:
+                return None
             
-            return "\n".join(content)
+            # Hash the body straight from the response array, without slicing it
+            digest = MessageDigest.getInstance("SHA-1")
+            digest.update(response, body_offset, body_length)
+            content_hash = "".join("%02x" % (b & 0xff) for b in digest.digest())
+            return response, body_offset, body_length, content_hash
             
         except Exception as e:
             self._log_message("Error downloading JS file: " + str(e))
             return None
     
-    def _save_temp_js_file(self, content, url):
-        """Save JavaScript content to temporary file."""
+    def _write_temp_file(self, url, response, body_offset, body_length):
+        """Write a downloaded body into a unique temporary file and return its path."""
+        # Create a safe filename from URL
+        safe_filename = re.sub(r'[^\w\-_\.]', '_', urlparse(url).path)
+        if safe_filename.endswith('.js'):
+            safe_filename = safe_filename[:-3]
+        
+        # Create a unique temporary file; it may sit in the batch queue for a while
+        fd, temp_file = tempfile.mkstemp(prefix="jshunter_" + safe_filename + "_", suffix=".js")
+        os.close(fd)
+        
         try:
-            # Create a safe filename from URL
-            safe_filename = re.sub(r'[^\w\-_\.]', '_', urlparse(url).path)
-            if not safe_filename.endswith('.js'):
-                safe_filename += '.js'
-            
-            # Create temporary file
-            temp_dir = tempfile.gettempdir()
-            temp_file = os.path.join(temp_dir, "jshunter_" + safe_filename)
-            
-            with open(temp_file, 'w') as f:
-                f.write(content)
-            
-            return temp_file
-            
-        except Exception as e:
-            self._log_message("Error creating temp file: " + str(e))
-            return None
+            output_stream = FileOutputStream(temp_file)
+            try:
+                output_stream.write(response, body_offset, body_length)
+            finally:
+                output_stream.close()
+        except Exception:
+            os.unlink(temp_file)
+            raise
+        return temp_file
     
-    def _run_trufflehog(self, file_path, tr_bin):
-        """Run TruffleHog on a file and return findings."""
+    def _run_trufflehog(self, file_path, tr_bin, verify=False, timeout=TRUFFLEHOG_TIMEOUT):
+        """Run TruffleHog on a file or directory and yield findings as it prints them.
+        
+        Raises TruffleHogError once the output is exhausted if the run failed, timed out
+        or was cut short by unloading; findings yielded so far are then incomplete.
+        """
+        cmd = [tr_bin, "filesystem", file_path, "--json", "--concurrency=" + str(TRUFFLEHOG_CONCURRENCY)]
+        if not verify:
+            # Verification makes network calls for every candidate secret
+            cmd.append("--no-verification")
+        
+        # stderr goes to a file so a chatty TruffleHog can't block on a full pipe
+        stderr_file = tempfile.TemporaryFile()
         try:
-            cmd = [tr_bin, "filesystem", file_path, "--json"]
             # Use Popen for Python 2.7 compatibility
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            
-            # Wait for process with timeout (Python 2.7 compatible)
-            import signal
-            
-            def timeout_handler(signum, frame):
-                raise Exception("Timeout")
-            
-            # Set timeout signal
-            old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(60)  # 60 second timeout
-            
-            try:
-                stdout_data, stderr_data = proc.communicate()
-                signal.alarm(0)  # Cancel timeout
-                signal.signal(signal.SIGALRM, old_handler)  # Restore old handler
-                
-                if proc.returncode == 0:
-                    findings = []
-                    for line in stdout_data.strip().split('\n'):
-                        if line.strip():
-                            try:
-                                finding = json.loads(line)
-                                findings.append(finding)
-                            except ValueError:  # json.JSONDecodeError in Python 2.7
-                                continue
-                    return findings
-                else:
-                    self._log_message("TruffleHog error: " + stderr_data)
-                    return []
-                    
-            except Exception as timeout_error:
-                signal.alarm(0)  # Cancel timeout
-                signal.signal(signal.SIGALRM, old_handler)  # Restore old handler
-                proc.terminate()
-                if "Timeout" in str(timeout_error):
-                    self._log_message("TruffleHog timeout for file: " + file_path)
-                else:
-                    self._log_message("TruffleHog execution error: " + str(timeout_error))
-                return []
-                
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
         except Exception as e:
-            self._log_message("TruffleHog execution error: " + str(e))
-            return []
+            stderr_file.close()
+            raise TruffleHogError("execution error: " + str(e))
+        
+        timer, timed_out = _kill_after(proc, timeout)
+        interrupted = False
+        try:
+            for line in iter(proc.stdout.readline, b''):
+                if self._unloading:
+                    interrupted = True
+                    proc.kill()
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:  # json.JSONDecodeError in Python 2.7
+                    continue
+            proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+        
+        try:
+            if timed_out.is_set():
+                raise TruffleHogError("timed out after " + str(timeout) + "s on " + file_path)
+            if interrupted:
+                raise TruffleHogError("interrupted by extension unload")
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                raise TruffleHogError("exit code " + str(proc.returncode) + ": " +
+                                      stderr_file.read()[-2000:].decode('utf-8', 'ignore').strip())
+        finally:
+            stderr_file.close()
     
     def _send_to_discord(self, result):
         """Send findings to Discord webhook."""
@@ -666,54 +1209,130 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         # Java HTTP is always available in Burp Suite
             
         try:
-            # Separate verified and unverified findings
-            verified_findings = [f for f in result['findings'] if f.get('Verified', False)]
-            unverified_findings = [f for f in result['findings'] if not f.get('Verified', False)]
-            
-            # Send verified findings immediately
-            if verified_findings:
-                self._send_findings_to_discord(verified_findings, result['url'], True)
+            # Send verified findings first
+            if result['verified']:
+                self._send_findings_to_discord(result['verified'], result['url'], True)
             
             # Send unverified findings
-            if unverified_findings:
-                self._send_findings_to_discord(unverified_findings, result['url'], False)
+            if result['unverified']:
+                self._send_findings_to_discord(result['unverified'], result['url'], False)
                 
         except Exception as e:
             self._log_message("Error sending to Discord: " + str(e))
     
     def _send_findings_to_discord(self, findings, source_url, verified):
-        """Send findings to Discord using Java HTTP."""
+        """Queue findings for the Discord sender as one or more embeds."""
         try:
-            message = "[VERIFIED] **Verified Secrets**" if verified else "[UNVERIFIED] **Unverified Secrets**"
-            message += " found in " + source_url + "\n\n"
+            title = "[VERIFIED] Verified Secrets" if verified else "[UNVERIFIED] Unverified Secrets"
+            color = 0xE74C3C if verified else 0xF39C12
+            header = "Found in " + source_url + "\n\n"
             
+            # One block per finding, packed into embed descriptions; long values are split so
+            # every block fits in an embed. StringBuilders avoid quadratic string concatenation.
+            description = StringBuilder(DISCORD_MAX_EMBED_CHARS).append(header)
+            block = StringBuilder(DISCORD_RAW_CHUNK_CHARS + 256)
             for finding in findings:
                 detector_name = finding.get('DetectorName', 'Unknown')
                 raw_value = finding.get('Raw', '')
-                line_number = finding.get('SourceMetadata', {}).get('Data', {}).get('Filesystem', {}).get('line', 0)
+                line_number = finding['line']
                 
-                message += "**" + detector_name + "**\n"
-                message += "```\n" + raw_value + "\n```\n"
-                if line_number > 0:
-                    message += "Line: " + str(line_number) + "\n"
-                message += "\n"
-            
-            # Discord webhook payload
-            payload = {
-                "content": message,
-                "username": "JSHunter Bot",
-                "avatar_url": "https://i.imgur.com/4M34hi2.png"
-            }
-            
-            # Send HTTP request using Java
-            self._send_http_post(self._discord_webhook_url, payload)
+                for start in range(0, max(len(raw_value), 1), DISCORD_RAW_CHUNK_CHARS):
+                    block.setLength(0)
+                    block.append("**").append(detector_name).append("**\n")
+                    block.append("```\n").append(raw_value[start:start + DISCORD_RAW_CHUNK_CHARS]).append("\n```\n")
+                    if line_number > 0:
+                        block.append("Line: ").append(str(line_number)).append("\n")
+                    block.append("\n")
+                    
+                    if (description.length() > len(header) and
+                            description.length() + block.length() > DISCORD_MAX_EMBED_CHARS):
+                        self._discord_queue.put({"title": title, "description": description.toString(), "color": color})
+                        description.setLength(0)
+                        description.append(header)
+                    description.append(block)
+            self._discord_queue.put({"title": title, "description": description.toString(), "color": color})
             
-            self._log_message("Successfully sent " + str(len(findings)) + " " + 
-                            ("verified" if verified else "unverified") + " findings to Discord")
+            self._log_message("Queued " + str(len(findings)) + " " + 
+                            ("verified" if verified else "unverified") + " findings for Discord")
                 
         except Exception as e:
             self._log_message("Error sending findings to Discord: " + str(e))
     
+    def _discord_sender_worker(self):
+        """Send queued embeds to Discord, up to DISCORD_MAX_EMBEDS per webhook call."""
+        pending = None
+        while True:
+            embed = pending if pending is not None else self._discord_queue.get()
+            pending = None
+            if embed is _DISCORD_STOP:
+                return
+            
+            # Coalesce everything that arrives within the flush interval into one message
+            deadline = time.time() + DISCORD_FLUSH_INTERVAL
+            embeds = [embed]
+            total_chars = len(embed['title']) + len(embed['description'])
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    embed = self._discord_queue.get(True, remaining)
+                except Empty:
+                    break
+                if embed is _DISCORD_STOP:
+                    pending = embed
+                    break
+                
+                # Small groups of the same kind share an embed instead of taking a new one
+                target = next((e for e in embeds if e['title'] == embed['title'] and
+                               len(e['description']) + len(embed['description']) <= DISCORD_MAX_EMBED_CHARS), None)
+                if target is not None:
+                    embed_chars = len(embed['description'])
+                else:
+                    embed_chars = len(embed['title']) + len(embed['description'])
+                
+                if (total_chars + embed_chars > DISCORD_MAX_MESSAGE_CHARS or
+                        (target is None and len(embeds) == DISCORD_MAX_EMBEDS)):
+                    pending = embed
+                    break
+                
+                if target is not None:
+                    target['description'] += embed['description']
+                else:
+                    embeds.append(embed)
+                total_chars += embed_chars
+            
+            try:
+                self._post_discord_embeds(embeds)
+            except Exception as e:
+                self._log_message("Error sending findings to Discord: " + str(e))
+    
+    def _post_discord_embeds(self, embeds):
+        """Post one webhook message, backing off while Discord rate-limits us."""
+        payload = {
+            "username": "JSHunter Bot",
+            "avatar_url": "https://i.imgur.com/4M34hi2.png",
+            "embeds": embeds
+        }
+        
+        backoff = 1.0
+        for attempt in range(DISCORD_MAX_RETRIES):
+            response_code, retry_after = self._send_http_post(self._discord_webhook_url, payload)
+            if response_code == 429:
+                delay = retry_after if retry_after is not None else backoff
+                self._log_message("Discord rate limit hit, retrying in " + str(delay) + "s")
+                time.sleep(delay)
+                backoff *= 2
+                continue
+            
+            if 200 <= response_code < 300:
+                self._log_message("Successfully sent " + str(len(embeds)) + " embeds to Discord")
+            else:
+                self._log_message("Discord webhook failed with code: " + str(response_code))
+            return
+        
+        self._log_message("Giving up on Discord message after " + str(DISCORD_MAX_RETRIES) + " rate-limited attempts")
+    
     def _test_discord_webhook(self):
         """Test Discord webhook connection."""
         webhook_url = self._discord_webhook_field.getText().strip()
@@ -722,30 +1341,37 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             return
         
         self._discord_webhook_url = webhook_url
-        self._save_settings()  # Save the webhook URL
+        self._request_save_settings()  # Save the webhook URL
         
-        # Send test message
+        # Send test message off the EDT
+        payload = {
+            "content": "[TEST] **JSHunter Test Message**\n\nThis is a test message from JSHunter Burp Extension. If you receive this, your webhook is configured correctly!",
+            "username": "JSHunter Bot",
+            "avatar_url": "https://i.imgur.com/4M34hi2.png"
+        }
+        self._net_exec.execute(lambda: self._send_test_webhook(webhook_url, payload))
+    
+    def _send_test_webhook(self, webhook_url, payload):
+        """Post the Discord test message on a worker thread and report back on the EDT."""
         try:
-            payload = {
-                "content": "[TEST] **JSHunter Test Message**\n\nThis is a test message from JSHunter Burp Extension. If you receive this, your webhook is configured correctly!",
-                "username": "JSHunter Bot",
-                "avatar_url": "https://i.imgur.com/4M34hi2.png"
-            }
-            
             # Send HTTP request using Java
-            response_code = self._send_http_post(webhook_url, payload)
+            response_code, _ = self._send_http_post(webhook_url, payload)
             
             if response_code == 204:
-                JOptionPane.showMessageDialog(self._main_panel, "Test message sent successfully!", "Success", JOptionPane.INFORMATION_MESSAGE)
+                self._show_message_later("Test message sent successfully!", "Success", JOptionPane.INFORMATION_MESSAGE)
                 self._log_message("Discord webhook test successful")
             else:
-                JOptionPane.showMessageDialog(self._main_panel, "Webhook test failed. Response code: " + str(response_code), "Error", JOptionPane.ERROR_MESSAGE)
+                self._show_message_later("Webhook test failed. Response code: " + str(response_code), "Error", JOptionPane.ERROR_MESSAGE)
                 self._log_message("Discord webhook test failed with code: " + str(response_code))
                 
         except Exception as e:
-            JOptionPane.showMessageDialog(self._main_panel, "Error testing webhook: " + str(e), "Error", JOptionPane.ERROR_MESSAGE)
+            self._show_message_later("Error testing webhook: " + str(e), "Error", JOptionPane.ERROR_MESSAGE)
             self._log_message("Error testing Discord webhook: " + str(e))
     
+    def _show_message_later(self, message, title, message_type):
+        """Show a message dialog from any thread by scheduling it on the EDT."""
+        SwingUtilities.invokeLater(lambda: JOptionPane.showMessageDialog(self._main_panel, message, title, message_type))
+    
     def _test_trufflehog(self):
         """Test TruffleHog binary."""
         trufflehog_path = self._trufflehog_path_field.getText().strip()
@@ -753,45 +1379,47 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
             JOptionPane.showMessageDialog(self._main_panel, "Please enter a TruffleHog path", "Error", JOptionPane.ERROR_MESSAGE)
             return
         
+        # Run the checks off the EDT; results are posted back with invokeLater
+        self._trufflehog_status_label.setText("TruffleHog: Testing...")
+        self._net_exec.execute(lambda: self._run_trufflehog_test(trufflehog_path))
+    
+    def _run_trufflehog_test(self, trufflehog_path):
+        """Validate the TruffleHog binary on a worker thread and report back on the EDT."""
         try:
             # Test if the binary exists and is executable
             if not os.path.exists(trufflehog_path):
-                self._trufflehog_status_label.setText("TruffleHog: File not found")
-                JOptionPane.showMessageDialog(self._main_panel, "TruffleHog binary not found at: " + trufflehog_path, "Error", JOptionPane.ERROR_MESSAGE)
+                self._set_trufflehog_status_later("TruffleHog: File not found")
+                self._show_message_later("TruffleHog binary not found at: " + trufflehog_path, "Error", JOptionPane.ERROR_MESSAGE)
                 return
             
             if not os.access(trufflehog_path, os.X_OK):
-                self._trufflehog_status_label.setText("TruffleHog: Not executable")
-                JOptionPane.showMessageDialog(self._main_panel, "TruffleHog binary is not executable: " + trufflehog_path, "Error", JOptionPane.ERROR_MESSAGE)
+                self._set_trufflehog_status_later("TruffleHog: Not executable")
+                self._show_message_later("TruffleHog binary is not executable: " + trufflehog_path, "Error", JOptionPane.ERROR_MESSAGE)
                 return
             
-            # Test if it's a valid TruffleHog binary using official method
-            if self._verify_trufflehog_path(trufflehog_path):
-                # Get version info for display
-                try:
-                    proc = subprocess.Popen([trufflehog_path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                    stdout_data, stderr_data = proc.communicate()
-                    version_info = (stdout_data + stderr_data).decode('utf-8', errors='ignore').strip()
-                except:
-                    version_info = "trufflehog"
-                
-                self._trufflehog_status_label.setText("TruffleHog: " + version_info)
-                JOptionPane.showMessageDialog(self._main_panel, "TruffleHog test successful!\n" + version_info, "Success", JOptionPane.INFORMATION_MESSAGE)
+            # Test if it's a valid TruffleHog binary using official method (cached per file version)
+            version_info = self._check_trufflehog(trufflehog_path)
+            if version_info:
+                self._set_trufflehog_status_later("TruffleHog: " + version_info)
+                self._show_message_later("TruffleHog test successful!\n" + version_info, "Success", JOptionPane.INFORMATION_MESSAGE)
                 self._log_message("TruffleHog test successful: " + version_info)
             else:
-                self._trufflehog_status_label.setText("TruffleHog: Invalid binary")
-                JOptionPane.showMessageDialog(self._main_panel, "Invalid TruffleHog binary at: " + trufflehog_path, "Error", JOptionPane.ERROR_MESSAGE)
+                self._set_trufflehog_status_later("TruffleHog: Invalid binary")
+                self._show_message_later("Invalid TruffleHog binary at: " + trufflehog_path, "Error", JOptionPane.ERROR_MESSAGE)
                 self._log_message("TruffleHog test failed: binary not valid")
                 
-        except subprocess.TimeoutExpired:
-            self._trufflehog_status_label.setText("TruffleHog: Timeout")
-            JOptionPane.showMessageDialog(self._main_panel, "TruffleHog test timeout", "Error", JOptionPane.ERROR_MESSAGE)
-            self._log_message("TruffleHog test timeout")
+        except TruffleHogTimeout:
+            self._set_trufflehog_status_later("TruffleHog: Timeout")
+            self._show_message_later("TruffleHog test timeout", "Error", JOptionPane.ERROR_MESSAGE)
         except Exception as e:
-            self._trufflehog_status_label.setText("TruffleHog: Error")
-            JOptionPane.showMessageDialog(self._main_panel, "Error testing TruffleHog: " + str(e), "Error", JOptionPane.ERROR_MESSAGE)
+            self._set_trufflehog_status_later("TruffleHog: Error")
+            self._show_message_later("Error testing TruffleHog: " + str(e), "Error", JOptionPane.ERROR_MESSAGE)
             self._log_message("Error testing TruffleHog: " + str(e))
     
+    def _set_trufflehog_status_later(self, text):
+        """Update the TruffleHog status label from any thread."""
+        SwingUtilities.invokeLater(lambda: self._trufflehog_status_label.setText(text))
+    
     def _browse_trufflehog_path(self):
         """Open file chooser to select TruffleHog binary."""
         file_chooser = JFileChooser()
@@ -800,18 +1428,14 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         
         # Set initial directory to common TruffleHog locations
         current_path = self._trufflehog_path_field.getText().strip()
-        if current_path and os.path.exists(os.path.dirname(current_path)):
-            file_chooser.setCurrentDirectory(java.io.File(os.path.dirname(current_path)))
-        else:
-            # Try common locations
-            common_paths = ["/usr/local/bin", "/usr/bin", "/opt/trufflehog", os.path.expanduser("~/.local/bin")]
-            for path in common_paths:
-                if os.path.exists(path):
-                    file_chooser.setCurrentDirectory(java.io.File(path))
-                    break
+        if current_path and _path_exists(os.path.dirname(current_path)):
+            file_chooser.setCurrentDirectory(File(os.path.dirname(current_path)))
+        elif self._trufflehog_initial_dir:
+            # First existing common location, resolved in the background at load time
+            file_chooser.setCurrentDirectory(File(self._trufflehog_initial_dir))
         
         # Add file filter for executable files
-        class ExecutableFileFilter(javax.swing.filechooser.FileFilter):
+        class ExecutableFileFilter(FileFilter):
             def accept(self, file):
                 if file.isDirectory():
                     return True
@@ -832,83 +1456,124 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
                 file_path = selected_file.getAbsolutePath()
                 self._trufflehog_path_field.setText(file_path)
                 self._log_message("Selected TruffleHog binary: " + file_path)
+                self._trufflehog_verify_cache.clear()
                 
                 # Auto-test the selected binary
                 self._test_trufflehog()
     
     def _send_http_post(self, url, payload):
-        """Send HTTP POST request using Java's built-in HTTP capabilities."""
+        """Send HTTP POST request and return (response code, Retry-After seconds or None)."""
         try:
-            # Create URL object
-            url_obj = URL(url)
-            connection = url_obj.openConnection()
-            connection.setRequestMethod("POST")
-            connection.setRequestProperty("Content-Type", "application/json")
-            connection.setDoOutput(True)
-            
-            # Convert payload to JSON string
-            json_payload = json.dumps(payload)
-            
-            # Send the request using UTF-8 encoding
-            output_stream = connection.getOutputStream()
-            writer = OutputStreamWriter(output_stream, "UTF-8")
-            writer.write(json_payload)
-            writer.flush()
-            writer.close()
+            if _JSON_WRITER_COMPACT is not None:
+                body = HttpRequest.BodyPublishers.ofByteArray(_JSON_WRITER_COMPACT.writeValueAsBytes(payload))
+            else:
+                # ofString encodes as UTF-8
+                body = HttpRequest.BodyPublishers.ofString(_JSON_ENCODER_COMPACT.encode(payload))
             
-            # Get response code
-            response_code = connection.getResponseCode()
+            request = (HttpRequest.newBuilder(URI.create(url))
+                       .header("Content-Type", "application/json")
+                       .timeout(Duration.ofSeconds(30))
+                       .POST(body)
+                       .build())
             
-            # Close connection
-            connection.disconnect()
+            # The pooled client reuses its connection across posts
+            response = self._http_client.send(request, HttpResponse.BodyHandlers.discarding())
+            try:
+                retry_after = float(response.headers().firstValue("Retry-After").orElse(None))
+            except (TypeError, ValueError):
+                retry_after = None
             
-            return response_code
+            return response.statusCode(), retry_after
             
         except Exception as e:
             self._log_message("HTTP POST error: " + str(e))
-            return -1
+            return -1, None
     
     def _add_result_to_table(self, result):
         """Add scan result to the results table."""
-        verified_count = sum(1 for f in result['findings'] if f.get('Verified', False))
-        unverified_count = len(result['findings']) - verified_count
-        
         status = "Success" if result['success'] else "Failed: " + str(result['error'])
         
         row_data = [
             result['timestamp'],
             result['url'],
-            len(result['findings']),
-            verified_count,
-            unverified_count,
+            len(result['verified']) + len(result['unverified']),
+            len(result['verified']),
+            len(result['unverified']),
             status
         ]
         
-        self._table_model.addRow(row_data)
-        self._scan_results.add(result)
+        self._queue_row(self._table_model, row_data, result)
+    
+    def _queue_row(self, model, row, result=None):
+        """Queue a table row for the next EDT flush; safe to call from any thread."""
+        with self._pending_rows_lock:
+            self._pending_rows.append((model, row, result))
+    
+    def _flush_pending_rows(self):
+        """Add all queued rows to their tables. Runs on the EDT."""
+        with self._pending_rows_lock:
+            if not self._pending_rows:
+                return
+            rows = self._pending_rows
+            self._pending_rows = []
+        
+        # Only follow new rows if the user has not scrolled up to read older ones
+        scroll_bar = self._results_scroll_pane.getVerticalScrollBar()
+        at_bottom = scroll_bar.getValue() + scroll_bar.getVisibleAmount() >= scroll_bar.getMaximum()
+        
+        # Group rows per table so each table fires a single insert event
+        added_results = False
+        new_rows = {}
+        for model, row, result in rows:
+            new_rows.setdefault(model, Vector()).add(Vector(row))
+            if result is not None:
+                self._scan_results.append(result)
+                added_results = True
+        for model, data in new_rows.items():
+            start = model.getRowCount()
+            model.getDataVector().addAll(data)
+            model.fireTableRowsInserted(start, start + data.size() - 1)
+        
+        # Keep the results table index-aligned with _scan_results, which drops its oldest entries itself
+        excess = self._table_model.getRowCount() - len(self._scan_results)
+        if excess > 0:
+            self._table_model.getDataVector().subList(0, excess).clear()
+            self._table_model.fireTableRowsDeleted(0, excess - 1)
         
         # Auto-scroll to bottom
-        self._results_table.scrollRectToVisible(
-            self._results_table.getCellRect(self._table_model.getRowCount() - 1, 0, True)
-        )
+        if added_results and at_bottom:
+            self._results_table.scrollRectToVisible(
+                self._results_table.getCellRect(self._table_model.getRowCount() - 1, 0, True)
+            )
     
     def _log_message(self, message):
         """Log a message to the activity log."""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = LocalDateTime.now().format(_TS_FMT)
         log_entry = "[" + timestamp + "] " + message + "\n"
         
-        # Update UI in EDT
-        def update_log():
-            self._log_area.append(log_entry)
-            self._log_area.setCaretPosition(len(self._log_area.getText()))
-        
-        # Schedule UI update on EDT
-        from javax.swing import SwingUtilities
-        SwingUtilities.invokeLater(update_log)
+        # Picked up by the log flush timer on the EDT
+        self._log_queue.add(log_entry)
         
         # Also print to console
         print(log_entry.strip())
     
+    def _flush_log(self):
+        """Append all queued log lines at once. Runs on the EDT."""
+        entries = []
+        entry = self._log_queue.poll()
+        while entry is not None:
+            entries.append(entry)
+            entry = self._log_queue.poll()
+        if not entries:
+            return
+        
+        self._log_area.append("".join(entries))
+        document = self._log_area.getDocument()
+        length = document.getLength()
+        if length > LOG_MAX_CHARS:
+            document.remove(0, length - LOG_TRIM_CHARS)
+        self._log_area.setCaretPosition(document.getLength())
+    
     def getTabCaption(self):
         """Return the tab caption."""
         return "JSHunter"
@@ -918,6 +1583,43 @@ class BurpExtender(IBurpExtender, IHttpListener, ITab):
         return self._main_panel
 
 
+class LowPriorityThreadFactory(ThreadFactory):
+    """Creates daemon threads at minimum priority for background verification."""
+    
+    def newThread(self, runnable):
+        thread = Thread(runnable)
+        thread.setDaemon(True)
+        thread.setPriority(Thread.MIN_PRIORITY)
+        return thread
+
+
+class ScanTask(Runnable):
+    """Scan pool task that remembers its URL so a dropped scan can be rescheduled later."""
+    
+    def __init__(self, extension, url):
+        self._extension = extension
+        self.url = url
+    
+    def run(self):
+        self._extension._scan_javascript_url(self.url)
+
+
+class DropOldestScanPolicy(RejectedExecutionHandler):
+    """Drop the oldest queued scan for a new one, forgetting its URL so it is scanned when next seen."""
+    
+    def __init__(self, extension):
+        self._extension = extension
+    
+    def rejectedExecution(self, runnable, executor):
+        if executor.isShutdown():
+            return
+        evicted = executor.getQueue().poll()
+        if isinstance(evicted, ScanTask):
+            self._extension._scanned_urls.remove(evicted.url)
+            self._extension._log_message("Scan queue full, dropped: " + evicted.url)
+        executor.execute(runnable)
+
+
 # Event Listeners
 class TestWebhookListener(ActionListener):
     def __init__(self, extension):
@@ -933,7 +1635,7 @@ class AutoScanListener(ActionListener):
     
     def actionPerformed(self, event):
         self._extension._auto_scan_enabled = self._extension._auto_scan_checkbox.isSelected()
-        self._extension._save_settings()
+        self._extension._request_save_settings()
 
 
 class SendToDiscordListener(ActionListener):
@@ -942,7 +1644,36 @@ class SendToDiscordListener(ActionListener):
     
     def actionPerformed(self, event):
         self._extension._send_to_discord_enabled = self._extension._send_to_discord_checkbox.isSelected()
-        self._extension._save_settings()
+        self._extension._request_save_settings()
+
+class SettingsSaveListener(ActionListener):
+    def __init__(self, extension):
+        self._extension = extension
+    
+    def actionPerformed(self, event):
+        self._extension._flush_settings()
+
+class PendingRowsListener(ActionListener):
+    def __init__(self, extension):
+        self._extension = extension
+    
+    def actionPerformed(self, event):
+        self._extension._flush_pending_rows()
+
+class LogFlushListener(ActionListener):
+    def __init__(self, extension):
+        self._extension = extension
+    
+    def actionPerformed(self, event):
+        self._extension._flush_log()
+
+class VerifySecretsListener(ActionListener):
+    def __init__(self, extension):
+        self._extension = extension
+    
+    def actionPerformed(self, event):
+        self._extension._verify_secrets_enabled = self._extension._verify_secrets_checkbox.isSelected()
+        self._extension._request_save_settings()
 
 class TestTruffleHogListener(ActionListener):
     def __init__(self, extension):
@@ -1025,6 +1756,7 @@ class ClearResultsListener(ActionListener):
             self._extension._table_model.setRowCount(0)
             self._extension._scan_results.clear()
             self._extension._scanned_urls.clear()
+            self._extension._scanned_hashes.clear()
             self._extension._log_message("Results cleared")
 
 
@@ -1034,14 +1766,13 @@ class ExportResultsListener(ActionListener):
     
     def actionPerformed(self, event):
         file_chooser = JFileChooser()
-        file_chooser.setSelectedFile(java.io.File("jshunter_results.json"))
+        file_chooser.setSelectedFile(File("jshunter_results.json"))
         
         result = file_chooser.showSaveDialog(self._extension._main_panel)
         if result == JFileChooser.APPROVE_OPTION:
             try:
                 file = file_chooser.getSelectedFile()
-                with open(str(file), 'w') as f:
-                    json.dump(list(self._extension._scan_results), f, indent=2)
+                self._write_results(file)
                 
                 JOptionPane.showMessageDialog(
                     self._extension._main_panel, 
@@ -1059,7 +1790,30 @@ class ExportResultsListener(ActionListener):
                     JOptionPane.ERROR_MESSAGE
                 )
                 self._extension._log_message("Error exporting results: " + str(e))
-
+    
+    def _write_results(self, file):
+        """Stream the results to file one element at a time, without copying the deque."""
+        results = self._extension._scan_results
+        if _MAPPER is not None:
+            generator = _MAPPER.getFactory().createGenerator(
+                BufferedOutputStream(FileOutputStream(file), EXPORT_BUFFER_SIZE))
+            try:
+                generator.useDefaultPrettyPrinter()
+                generator.writeStartArray()
+                for result in results:
+                    _JSON_WRITER_STREAM.writeValue(generator, result)
+                generator.writeEndArray()
+            finally:
+                generator.close()
+        else:
+            with open(str(file), 'w', EXPORT_BUFFER_SIZE) as f:
+                f.write("[")
+                separator = "\n  "
+                for result in results:
+                    # json escapes newlines inside strings, so only layout newlines are indented
+                    f.write(separator + _JSON_ENCODER_PRETTY.encode(result).replace("\n", "\n  "))
+                    separator = ",\n  "
+                f.write("\n]\n")
 
 class ResultDetailsListener(MouseAdapter):
     def __init__(self, extension):
@@ -1075,7 +1829,7 @@ class ResultDetailsListener(MouseAdapter):
             return
         
         model_row = self._extension._results_table.convertRowIndexToModel(selected_row)
-        result = self._extension._scan_results.get(model_row)
+        result = self._extension._scan_results[model_row]
         
         # Create details dialog
         dialog = JDialog(None, "Scan Result Details", True)
@@ -1097,24 +1851,24 @@ class ResultDetailsListener(MouseAdapter):
         findings_panel.setBorder(BorderFactory.createTitledBorder("Findings"))
         
         column_names = ["Detector", "Verified", "Line", "Value"]
-        findings_model = DefaultTableModel(column_names, 0)
-        
-        findings_table = JTable(findings_model)
-        findings_table.setRowSorter(TableRowSorter(findings_model))
-        
-        for finding in result['findings']:
+        data = Vector()
+        for finding in chain(result['verified'], result['unverified']):
             detector_name = finding.get('DetectorName', 'Unknown')
-            raw_value = finding.get('Raw', '')
             verified = finding.get('Verified', False)
-            line_number = finding.get('SourceMetadata', {}).get('Data', {}).get('Filesystem', {}).get('line', 0)
+            line_number = finding['line']
             
             row_data = [
                 detector_name,
                 "Yes" if verified else "No",
                 line_number if line_number > 0 else "",
-                raw_value[:100] + "..." if len(raw_value) > 100 else raw_value
+                finding['_display_raw']
             ]
-            findings_model.addRow(row_data)
+            data.add(Vector(row_data))
+        
+        # Hand all rows to the model at once instead of firing an event per row
+        findings_model = DefaultTableModel(data, Vector(column_names))
+        findings_table = JTable(findings_model)
+        findings_table.setRowSorter(TableRowSorter(findings_model))
         
         findings_panel.add(JScrollPane(findings_table), BorderLayout.CENTER)
         